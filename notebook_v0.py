@@ -6,15 +6,34 @@ starter code for your evaluation assignment
 """
 
 # Python Standard Library
-import base64
+import binascii
+import builtins
 import io
 import json
 import pprint
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-Party Libraries
 import numpy as np
 import PIL.Image  # pillow
 
+try:
+    import orjson  # faster JSON (de)serialization, optional
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # streaming JSON parser, optional
+except ImportError:
+    ijson = None
+
+# Cell markers used by the text serializers
+_MARKDOWN_HEADER = '# %% [markdown]\n'
+_CODE_HEADER = '# %%\n'
+_PYTHON_HEADER = '# %% [python]\n'
+_COMMENT = '# '
+_CELL_SEPARATOR = '\n\n'
+
 
 def load_ipynb(filename):
     r"""
@@ -51,7 +70,10 @@ def load_ipynb(filename):
          'nbformat_minor': 5}
     """
     with open(filename, 'rb') as f:
-        return json.load(f)
+        data = f.read()
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
 
 
 def save_ipynb(ipynb, filename):
@@ -74,8 +96,12 @@ def save_ipynb(ipynb, filename):
         True
 
     """
-    with open(filename, "w") as f:
-        return json.dump(ipynb, f)
+    if orjson is None:
+        with open(filename, "wb") as f:
+            f.write(json.dumps(ipynb, ensure_ascii=False, separators=(",", ":")).encode('utf-8'))
+        return
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(ipynb))
 
 
 def get_format_version(ipynb):
@@ -153,6 +179,53 @@ def get_cells(ipynb):
     return ipynb['cells']
 
 
+def iter_cells(filename):
+    r"""
+    Iterate the cells of a jupyter notebook .ipynb file without loading
+    the whole notebook in memory first.
+
+    This saves memory on large notebooks, at the cost of speed: streaming
+    is several times slower than load_ipynb.
+
+    Usage:
+
+        >>> for cell in iter_cells("samples/hello-world.ipynb"):
+        ...     print(cell['id'])
+        a9541506
+        b777420a
+        a23ab5ac
+    """
+    if ijson is None:
+        yield from get_cells(load_ipynb(filename))
+        return
+    with open(filename, 'rb') as f:
+        yield from ijson.items(f, 'cells.item', use_float=True)
+
+
+def load_format_version(filename):
+    r"""
+    Return the format version (str) of a jupyter notebook .ipynb file,
+    without building the notebook cells.
+
+    This saves memory on large notebooks, at the cost of speed: the whole
+    file is still scanned (Jupyter writes the version after the cells),
+    more slowly than load_ipynb parses it.
+
+    Usage:
+
+        >>> load_format_version("samples/hello-world.ipynb")
+        '4.5'
+    """
+    if ijson is None:
+        return get_format_version(load_ipynb(filename))
+    version = {}
+    with open(filename, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if event == 'number' and prefix in ('nbformat', 'nbformat_minor'):
+                version[prefix] = value
+    return get_format_version(version)
+
+
 def to_percent(ipynb):
     r"""
     Convert a ipynb notebook (dict) to a Python code in the percent format (str).
@@ -177,21 +250,13 @@ def to_percent(ipynb):
         ...     with open(notebook_file.with_suffix(".py"), "w", encoding="utf-8") as output:
         ...         print(percent_code, file=output)
     """
-    ans = []
+    cells = []
     for dic in ipynb['cells']:
         if dic['cell_type'] == 'markdown':
-            ans.append('# %% [markdown]\n')
-            for elem in dic['source']:
-                ans.append('# ')
-                ans.append(elem)
+            cells.append(_MARKDOWN_HEADER + "".join([_COMMENT + elem for elem in dic['source']]))
         elif dic['cell_type'] == 'code':
-            ans.append('# %%\n')
-            for elem in dic['source']:
-                ans.append(elem)
-        ans.append('\n')
-        ans.append('\n')
-    ans.pop()
-    return "".join(ans)
+            cells.append(_CODE_HEADER + "".join(dic['source']))
+    return _CELL_SEPARATOR.join(cells) + '\n'
 
 
 def starboard_html(code):
@@ -248,35 +313,14 @@ def to_starboard(ipynb, html=False):
         ...     with open(notebook_file.with_suffix(".html"), "w", encoding="utf-8") as output:
         ...         print(starboard_html, file=output)
     """
-    if html == False:
-        list = []
-        for dic in ipynb['cells']:
-            if dic['cell_type'] == 'markdown':
-                list.append('# %% [markdown]\n')
-                for elem in dic['source']:
-                    list.append(elem)
-            elif dic['cell_type'] == 'code':
-                list.append('# %% [python]\n')
-                for elem in dic['source']:
-                    list.append(elem)
-            list.append('\n')
-        list.pop()
-        return "".join(str(elem) for elem in list)
-    
-    if html == True:
-        ans = []
-        for dic in ipynb['cells']:
-            if dic['cell_type'] == 'markdown':
-                ans.append('# %% [markdown]\n')
-            else:
-                ans.append('# %% [python]\n')
-            for elem in dic['source']:
-                ans.append(elem)
-            ans.append('\n')
-        ans.pop()
-        string54 = "".join(ans)
-    return starboard_html(string54)
-hello = load_ipynb("samples/hello-world.ipynb")
+    ans = []
+    for dic in ipynb['cells']:
+        if dic['cell_type'] == 'markdown':
+            ans.append(_MARKDOWN_HEADER + "".join(dic['source']))
+        elif dic['cell_type'] == 'code':
+            ans.append(_PYTHON_HEADER + "".join(dic['source']))
+    code = "\n".join(ans)
+    return starboard_html(code) if html else code
 
 
 # Outputs
@@ -354,20 +398,21 @@ def get_stream(ipynb, stdout=True, stderr=False):
         👋 Hello world! 🌍
         🔥 This is fine. 🔥 (https://gunshowcomic.com/648)
     """
-    output2 = []
-    for dic in ipynb['cells']:
-        if dic['cell_type'] == 'code':
-            if stdout == True and dic['outputs'][0]['name'] == 'stdout':
-                output2.append(dic['outputs'][0]['text'][0])
-            if stderr == True and dic['outputs'][0]['name'] == 'stderr':
-                output2.append(dic['outputs'][0]['text'][0])
-    return ("".join(str(elem) for elem in output2))
+    wanted = {name for name, flag in (('stdout', stdout), ('stderr', stderr)) if flag}
+    return "".join([
+        outputs[0]['text'][0]
+        for dic in ipynb['cells']
+        if dic['cell_type'] == 'code' and (outputs := dic['outputs']) and outputs[0].get('name') in wanted
+    ])
 
 
 def get_exceptions(ipynb):
     r"""
     Return all exceptions raised during cell executions.
 
+    Exceptions whose name is not a builtin exception class
+    (e.g. a user-defined `MyErr`) are returned as plain `Exception`s.
+
     Usage:
 
         >>> ipynb = load_ipynb("samples/hello-world.ipynb")
@@ -383,12 +428,24 @@ def get_exceptions(ipynb):
         TypeError("unsupported operand type(s) for +: 'int' and 'str'")
         Warning('🌧️  light rain')
     """
-    excep = []
-    for dic in ipynb['cells']:
-        if dic['cell_type'] == 'code':
-            if dic['outputs'][0]['output_type'] == 'error':
-                excep.append(eval("".join([dic['outputs'][0]['ename'], "(", repr(dic['outputs'][0]['evalue']), ")"])))
-    return excep
+    return [
+        _make_exception(outputs[0]['ename'], outputs[0]['evalue'])
+        for dic in ipynb['cells']
+        if dic['cell_type'] == 'code' and (outputs := dic['outputs']) and outputs[0]['output_type'] == 'error'
+    ]
+
+
+_EXCEPTION_CLASSES = {}
+
+
+def _make_exception(ename, evalue):
+    exception_class = _EXCEPTION_CLASSES.get(ename)
+    if exception_class is None:
+        exception_class = getattr(builtins, ename, None)
+        if not (isinstance(exception_class, type) and issubclass(exception_class, BaseException)):
+            exception_class = Exception
+        _EXCEPTION_CLASSES[ename] = exception_class
+    return exception_class(evalue)
 
 
 def get_images(ipynb):
@@ -412,10 +469,70 @@ def get_images(ipynb):
                 ...,
                 [ 14,  13,  19]]], dtype=uint8)
     """
-    answer = []
-    for dic in ipynb['cells']:
-        if dic['cell_type'] == 'code' and len(dic['outputs']) != 0 and 'image/png' in dic['outputs'][0]['data']:
-            image = PIL.Image.open(io.BytesIO(base64.b64decode(dic['outputs'][0]['data']['image/png'])))
-            arr = np.array(image)
-            answer.append(arr)
-    return answer
+    pngs = [
+        dic['outputs'][0]['data']['image/png']
+        for dic in ipynb['cells']
+        if dic['cell_type'] == 'code' and dic['outputs'] and 'image/png' in dic['outputs'][0].get('data', {})
+    ]
+    if len(pngs) < 2:
+        return [_decode_png(png) for png in pngs]
+    # PIL releases the GIL while decompressing, so the images decode in parallel
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(_decode_png, pngs))
+
+
+def _decode_png(png):
+    return np.array(PIL.Image.open(io.BytesIO(binascii.a2b_base64(png))))
+
+
+def to_grayscale(image):
+    r"""
+    Convert a RGB(A) image (as returned by get_images) to a grayscale image.
+    Single-channel (2-D) uint8 images are already grayscale and are returned
+    unchanged; other 2-D arrays raise ValueError.
+
+    Usage:
+
+        >>> ipynb = load_ipynb("samples/images.ipynb")
+        >>> grace_hopper_image = to_grayscale(get_images(ipynb)[0])
+        >>> np.shape(grace_hopper_image)
+        (600, 512)
+        >>> grace_hopper_image.dtype
+        dtype('uint8')
+    """
+    if image.ndim == 2:
+        if image.dtype != np.uint8:
+            raise ValueError(f"expected a uint8 grayscale image, got dtype {image.dtype}")
+        return image
+    if image.ndim != 3 or image.shape[2] < 3:
+        raise ValueError(f"expected a 2-D image or a RGB(A) image, got shape {image.shape}")
+    kernel = _get_gray_kernel()
+    if kernel is not None:
+        return kernel(np.ascontiguousarray(image))
+    r, g, b = (image[..., k].astype(np.uint16) for k in range(3))
+    return ((r * 54 + g * 183 + b * 19) >> 8).astype(np.uint8)
+
+
+_gray_kernel = None
+
+
+def _get_gray_kernel():
+    # numba is optional and slow to import, so only load it on first use
+    global _gray_kernel
+    if _gray_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            _gray_kernel = False
+            return None
+
+        @numba.njit(parallel=True, cache=True)
+        def kernel(image):
+            gray = np.empty(image.shape[:2], np.uint8)
+            for i in numba.prange(image.shape[0]):
+                for j in range(image.shape[1]):
+                    gray[i, j] = (image[i, j, 0] * 54 + image[i, j, 1] * 183 + image[i, j, 2] * 19) >> 8
+            return gray
+
+        _gray_kernel = kernel
+    return _gray_kernel or None
@@ -159,6 +159,14 @@ class Question2(unittest.TestCase):
             get_cells(ipynb),
         )
 
+    def test_iter_cells_hello_world(self):
+        ipynb = load_ipynb("samples/hello-world.ipynb")
+        self.assertEqual(get_cells(ipynb), list(iter_cells("samples/hello-world.ipynb")))
+
+    def test_load_format_version(self):
+        self.assertEqual("4.5", load_format_version("samples/minimal.ipynb"))
+        self.assertEqual("4.5", load_format_version("samples/hello-world.ipynb"))
+
 class Question3(unittest.TestCase):
     def test_to_percent_hello_world(self):
         ipynb = load_ipynb("samples/hello-world.ipynb")
@@ -193,6 +201,18 @@ Goodbye! 👋""",
             to_starboard(ipynb),
         )
 
+    def test_to_starboard_skips_raw_cells(self):
+        ipynb = {
+            "cells": [
+                {"cell_type": "raw", "id": "r", "metadata": {}, "source": ["raw text"]},
+                {"cell_type": "code", "execution_count": 1, "id": "c", "metadata": {}, "outputs": [], "source": ["x = 1"]},
+            ],
+            "metadata": {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        self.assertEqual("# %% [python]\nx = 1", to_starboard(ipynb))
+
 class Question4(unittest.TestCase):
     def test_to_starboard_html(self):
         self.maxDiff = None
@@ -296,6 +316,27 @@ class Question7(unittest.TestCase):
         )
         self.assertEqual("Warning('🌧️  light rain')", repr(errors[1]))
 
+    def test_exceptions_unknown_name(self):
+        ipynb = {
+            "cells": [
+                {
+                    "cell_type": "code",
+                    "execution_count": 1,
+                    "id": "c",
+                    "metadata": {},
+                    "outputs": [{"output_type": "error", "ename": "MyErr", "evalue": "boom", "traceback": []}],
+                    "source": ["raise MyErr('boom')"],
+                },
+            ],
+            "metadata": {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        errors = get_exceptions(ipynb)
+        self.assertEqual(1, len(errors))
+        self.assertIs(Exception, type(errors[0]))
+        self.assertEqual("Exception('boom')", repr(errors[0]))
+
 class Question8(unittest.TestCase):
     def test_get_images(self):
         ipynb = load_ipynb("samples/images.ipynb")
@@ -308,6 +349,22 @@ class Question8(unittest.TestCase):
         self.assertEqual((600, 512, 3), grace_hopper_image.shape)
         self.assertEqual(np.uint8, grace_hopper_image.dtype)
 
+    def test_to_grayscale(self):
+        ipynb = load_ipynb("samples/images.ipynb")
+        gray = to_grayscale(get_images(ipynb)[0])
+        self.assertEqual((600, 512), gray.shape)
+        self.assertEqual(np.uint8, gray.dtype)
+
+    def test_to_grayscale_2d(self):
+        image = np.zeros((4, 5), dtype=np.uint8)
+        self.assertIs(image, to_grayscale(image))
+        with self.assertRaises(ValueError):
+            to_grayscale(np.zeros((4, 5), dtype=np.float64))
+        with self.assertRaises(ValueError):
+            to_grayscale(np.zeros((4, 5), dtype=bool))
+        with self.assertRaises(ValueError):
+            to_grayscale(np.zeros((4, 5, 2), dtype=np.uint8))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,17 @@ an object-oriented version of the notebook toolbox
 
 import json
 
+try:
+    import orjson  # faster JSON (de)serialization, optional
+except ImportError:
+    orjson = None
+
+# Cell markers used by the text serializers
+_MARKDOWN_HEADER = '# %% [markdown]\n'
+_CODE_HEADER = '# %%\n'
+_COMMENT = '# '
+_CELL_SEPARATOR = '\n\n'
+
 class CodeCell:
     r"""A Cell of Python code in a Jupyter notebook.
 
@@ -34,6 +45,8 @@ class CodeCell:
         ['print("Hello world!")']
     """
 
+    __slots__ = ('id', 'cell_type', 'execution_count', 'source')
+
     def __init__(self, ipynb):
         self.id = ipynb['id']
         self.cell_type = ipynb['cell_type']
@@ -68,11 +81,15 @@ class MarkdownCell:
         ['Hello world!\n', '============\n', 'Print `Hello world!`:']
     """
 
+    __slots__ = ('cell_type', 'id', 'source')
+
     def __init__(self, ipynb):
         self.cell_type = ipynb['cell_type']
         self.id = ipynb['id']
         self.source = ipynb['source']
 
+_CELL_CLASSES = {'code': CodeCell, 'markdown': MarkdownCell}
+
 class Notebook:
     r"""A Jupyter Notebook.
 
@@ -81,6 +98,8 @@ class Notebook:
 
     Attributes:
         version (str): the version of the notebook format.
+        nbformat (int): the major version of the notebook format.
+        nbformat_minor (int): the minor version of the notebook format.
         cells (list): a list of cells (either CodeCell or MarkdownCell).
 
     Usage:
@@ -103,14 +122,25 @@ class Notebook:
     """
 
     def __init__(self, ipynb):
-        self.version = f"{ipynb['nbformat']}.{ipynb['nbformat_minor']}"
-        self.cells = []
-        for dic in ipynb['cells']:
-            if dic['cell_type'] == 'code':
-                self.cells.append(CodeCell(dic))
-            elif dic['cell_type'] == 'markdown':
-                self.cells.append(MarkdownCell(dic))
+        self.nbformat = ipynb['nbformat']
+        self.nbformat_minor = ipynb['nbformat_minor']
+        self.cells = [
+            _CELL_CLASSES[dic['cell_type']](dic)
+            for dic in ipynb['cells']
+            if dic['cell_type'] in _CELL_CLASSES
+        ]
+
+
+    @property
+    def version(self):
+        r"""The version of the notebook format, as a "major.minor" str.
+        """
+        return f"{self.nbformat}.{self.nbformat_minor}"
 
+    @version.setter
+    def version(self, version):
+        nbformat, nbformat_minor = version.split(".")
+        self.nbformat, self.nbformat_minor = int(nbformat), int(nbformat_minor)
 
     @staticmethod
     def from_file(filename):
@@ -123,7 +153,10 @@ class Notebook:
             '4.5'
         """
         with open(filename, "rb") as f:
-            return Notebook(json.load(f))
+            data = f.read()
+        if orjson is None:
+            return Notebook(json.loads(data))
+        return Notebook(orjson.loads(data))
         
 
     def __iter__(self):
@@ -140,6 +173,14 @@ class Notebook:
         """
         return iter(self.cells)
 
+def _markdown_to_py_percent(cell):
+    return _MARKDOWN_HEADER + "".join([_COMMENT + elem for elem in cell.source])
+
+def _code_to_py_percent(cell):
+    return _CODE_HEADER + "".join(cell.source)
+
+_PY_PERCENT_RENDERERS = {MarkdownCell: _markdown_to_py_percent, CodeCell: _code_to_py_percent}
+
 class PyPercentSerializer:
     r"""Prints a given Notebook in py-percent format.
 
@@ -167,20 +208,11 @@ class PyPercentSerializer:
     def to_py_percent(self):
         r"""Converts the notebook to a string in py-percent format.
         """
-        ans = []
-        for cell in self.notebook:
-            if isinstance(cell, MarkdownCell):
-                ans.append('# %% [markdown]\n')
-                for elem in cell.source:
-                    ans.append('# ')
-                    ans.append(elem)
-            elif isinstance(cell, CodeCell):
-                ans.append('# %%\n')
-                for elem in cell.source:
-                    ans.append(elem)
-            ans.append('\n\n')
-        ans.pop()
-        return "".join(ans)
+        return _CELL_SEPARATOR.join([
+            render(cell)
+            for cell in self.notebook
+            if (render := _PY_PERCENT_RENDERERS.get(type(cell))) is not None
+        ])
 
     def to_file(self, filename):
         r"""Serializes the notebook to a file
@@ -239,23 +271,26 @@ class Serializer:
         Returns:
             dict: a dictionary representing the notebook.
         """
-        dic = {'cells' : [], 'metadata' : {}}
+        cells = []
         for cell in self.nb:
-            new_dic = {}
             if isinstance(cell, MarkdownCell):
-                new_dic['cell_type'] = cell.cell_type
-                new_dic['id'] = cell.id
-                new_dic['medatada'] = {}
-                new_dic['source'] = cell.source
+                cells.append({
+                    'cell_type': cell.cell_type,
+                    'id': cell.id,
+                    'medatada': {},
+                    'source': cell.source,
+                })
             elif isinstance(cell, CodeCell):
-                new_dic['cell_type'] = cell.cell_type
-                new_dic['execution_count'] = cell.execution_count
-                new_dic['id'] = cell.id
-                new_dic['medatada'] = {}
-                new_dic['outputs'] = []
-                new_dic['source'] = cell.source
-            dic['cells'].append(new_dic)
-        dic['nbformat'], dic['nbformat_minor'] = int(self.nb.version.split(".")[0]), int(self.nb.version.split(".")[1])
+                cells.append({
+                    'cell_type': cell.cell_type,
+                    'execution_count': cell.execution_count,
+                    'id': cell.id,
+                    'medatada': {},
+                    'outputs': [],
+                    'source': cell.source,
+                })
+        dic = {'cells' : cells, 'metadata' : {}}
+        dic['nbformat'], dic['nbformat_minor'] = self.nb.nbformat, self.nb.nbformat_minor
         return dic
 
     def to_file(self, filename):
@@ -276,8 +311,12 @@ class Serializer:
                 b777420a
                 a23ab5ac
         """
-        with open(filename, 'w') as f:
-            json.dump(self.serialize(), f, indent=1)
+        if orjson is None:
+            with open(filename, 'wb') as f:
+                f.write(json.dumps(self.serialize(), indent=2, ensure_ascii=False).encode('utf-8'))
+            return
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(self.serialize(), option=orjson.OPT_INDENT_2))
 
 class Outliner:
     r"""Quickly outlines the strucure of the notebook in a readable format.
@@ -310,27 +349,26 @@ class Outliner:
             str: a string representing the outline of the notebook.
         """
         out = [f"Jupyter Notebook v{self.notebook.version}\n"]
+        append = out.append
         for cell in self.notebook:
-            if isinstance(cell, MarkdownCell):
-                out.append(f"└─▶ Markdown cell #{cell.id}\n")
-                if len(cell.source) > 1:
-                    out.append(f"    ┌  {cell.source[0]}")
-                    for i in range(1, len(cell.source) - 1):
-                        out.append(f"    │  {cell.source[i]}")
-                    out.append(f"    └  {cell.source[-1]}")
-                if len(cell.source) == 1:
-                    out.append(f"    | {cell.source[0]}")
-                out.append("\n")                
-            if isinstance(cell, CodeCell):
-                out.append(f"└─▶ Code cell #{cell.id} ({cell.execution_count})\n")
-                if len(cell.source) > 1:
-                    out.append(f"    ┌ {cell.source[0]}")
-                    for i in range(1, len(cell.source) - 1):
-                        out.append(f"    │ {cell.source[i]}")
-                    out.append(f"    └ {cell.source[-1]}")
-                if len(cell.source) == 1:
-                    out.append(f"    | {cell.source[0]}")
-                out.append("\n")
+            cell_type = type(cell)
+            if cell_type is MarkdownCell:
+                append(f"└─▶ Markdown cell #{cell.id}\n")
+                first, middle, last = "    ┌  ", "    │  ", "    └  "
+            elif cell_type is CodeCell:
+                append(f"└─▶ Code cell #{cell.id} ({cell.execution_count})\n")
+                first, middle, last = "    ┌ ", "    │ ", "    └ "
+            else:
+                continue
+            source = cell.source
+            if len(source) > 1:
+                append(first + source[0])
+                for line in source[1:-1]:
+                    append(middle + line)
+                append(last + source[-1])
+            elif len(source) == 1:
+                append("    | " + source[0])
+            append("\n")
         out.pop()
         return "".join(out)
 # %%
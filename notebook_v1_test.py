@@ -54,6 +54,12 @@ class Question10(unittest.TestCase):
         nb = Notebook.from_file("samples/minimal.ipynb")
         self.assertEqual("4.5", nb.version)
 
+    def test_set_version(self):
+        nb = Notebook.from_file("samples/minimal.ipynb")
+        nb.version = "4.4"
+        self.assertEqual("4.4", nb.version)
+        self.assertEqual((4, 4), (nb.nbformat, nb.nbformat_minor))
+
 class Question11(unittest.TestCase):
     def test_iter_dunder(self):
         nb = Notebook.from_file("samples/hello-world.ipynb")
@@ -5,7 +5,32 @@
 an object-oriented version of the notebook toolbox
 """
 
+import hashlib
+import itertools
 import json
+import mmap
+import os
+import pickle
+import sys
+from typing import List, Optional
+
+try:
+    import orjson  # faster JSON (de)serialization, optional
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # streaming JSON parser, optional
+except ImportError:
+    ijson = None
+
+_MARKDOWN_HEADER_BYTES = b'# %% [markdown]'
+
+# per-user directory for NotebookLoader(..., cache=True) pickles
+_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "notebook_v2",
+)
 
 class CodeCell:
     r"""A Cell of Python code in a Jupyter notebook.
@@ -31,6 +56,8 @@ class CodeCell:
         >>> code_cell.source
         ['print("Hello world!")']
     """
+    __slots__ = ('id', 'source', 'execution_count')
+
     def __init__(self, id, source, execution_count):
         self.id = id
         self.source = source
@@ -59,6 +86,8 @@ class MarkdownCell(CodeCell):
         >>> markdown_cell.source
         ['Hello world!', '============', 'Print `Hello world!`:']
     """
+    __slots__ = ()
+
     def __init__(self, id, source):
         super().__init__(id, source, None)
 
@@ -67,7 +96,9 @@ class Notebook:
 
     Args:
         version (str): The version of the notebook format.
-        cells (list): The cells of the notebook (either CodeCell or MarkdownCell).
+        cells (iterable): The cells of the notebook (either CodeCell or MarkdownCell).
+            A list is stored as is; any other iterable is turned into a list.
+            To stream cells without storing them, use NotebookLoader.iter_cells.
 
     Attributes:
         version (str): The version of the notebook format.
@@ -94,21 +125,69 @@ class Notebook:
         >>> isinstance(nb.cells[1], CodeCell)
         True
     """
+    __slots__ = ('version', 'cells')
 
     def __init__(self, version, cells):
         self.version = version
-        self.cells = cells
-    
+        self.cells = cells if isinstance(cells, list) else list(cells)
+
     def __iter__(self):
         r"""Iterate the cells of the notebook.
         """
         return iter(self.cells)
 
+    def map_cells(self, function):
+        r"""Replaces every cell by function(cell), in a single pass.
+
+        Returns:
+            Notebook: the notebook itself.
+        """
+        cells = self.cells
+        for i, cell in enumerate(cells):
+            cells[i] = function(cell)
+        return self
+
+    def filter_cells(self, predicate):
+        r"""Keeps only the cells for which predicate(cell) is true, in a single pass.
+
+        Returns:
+            Notebook: the notebook itself.
+        """
+        self.cells = [cell for cell in self.cells if predicate(cell)]
+        return self
+
+_SOURCE_POOL = {}
+_SOURCE_POOL_MAX_SIZE = 100_000
+
+def _pooled_source(source):
+    r"""Shares one str object between identical short source lines
+    (blank lines, imports, ...) across all the cells loaded so far.
+    """
+    if isinstance(source, str):
+        return source
+    pool = _SOURCE_POOL
+    if len(pool) > _SOURCE_POOL_MAX_SIZE:
+        pool.clear()
+    return [pool.setdefault(line, line) if len(line) < 64 else line for line in source]
+
+_VERSION_CACHE = {} # (nbformat, nbformat_minor) -> "nbformat.nbformat_minor"
+
+_CELL_FACTORIES = {
+    'code': lambda dic: CodeCell(sys.intern(dic['id']), _pooled_source(dic['source']), dic['execution_count']),
+    'markdown': lambda dic: MarkdownCell(sys.intern(dic['id']), _pooled_source(dic['source'])),
+}
+
 class NotebookLoader:
     r"""Loads a Jupyter Notebook from a file
 
     Args:
         filename (str): The name of the file to load.
+        cache (bool): If True, keep a pickled copy of the loaded notebook
+            in a per-user cache directory ($XDG_CACHE_HOME/notebook_v2, or
+            ~/.cache/notebook_v2) and reuse it on later loads until the file
+            changes (defaults to False). Unpickling runs code, so only enable
+            this if that directory is trusted (it is created private to the
+            user).
 
     Usage:
             >>> nbl = NotebookLoader("samples/hello-world.ipynb")
@@ -121,22 +200,82 @@ class NotebookLoader:
             b777420a
             a23ab5ac
     """
-    def __init__(self, filename):
+    def __init__(self, filename, cache=False):
         self.filename = filename
+        self.cache = cache
 
     def load(self):
         r"""Loads a Notebook instance from the file.
         """
-        nb = json.load(open(self.filename, 'rb'))
-        cell = []
-        for dic in nb['cells']:
-            if dic['cell_type'] == 'code':
-                cell.append(CodeCell(dic['id'], dic['source'], dic['execution_count']))
-            elif dic['cell_type'] == 'markdown':
-                cell.append(MarkdownCell(dic['id'], dic['source']))
-        return Notebook(f"{nb['nbformat']}.{nb['nbformat_minor']}", cell)
-
-class Markdownizer(Notebook):
+        if not self.cache:
+            return self._parse()
+        stat = os.stat(self.filename)
+        key = (stat.st_mtime_ns, stat.st_size)
+        path = os.path.abspath(os.fspath(self.filename))
+        cache_filename = os.path.join(_CACHE_DIR, hashlib.sha256(path.encode("utf-8")).hexdigest() + '.pkl')
+        try:
+            with open(cache_filename, 'rb') as f:
+                cached_key, nb = pickle.load(f)
+            if cached_key == key:
+                return nb
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+            pass
+        nb = self._parse()
+        try:
+            os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+            with open(cache_filename, 'wb') as f:
+                pickle.dump((key, nb), f, protocol=5)
+        except OSError:
+            pass
+        return nb
+
+    def _parse(self):
+        with open(self.filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # empty files cannot be mapped; let the parser report the error
+                data = f.read()
+                nb = json.loads(data) if orjson is None else orjson.loads(data)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if orjson is None:
+                        nb = json.loads(data.read())
+                    else:
+                        with memoryview(data) as view:
+                            nb = orjson.loads(view)
+        get_factory = _CELL_FACTORIES.get
+        cells = [
+            factory(dic)
+            for dic in nb['cells']
+            if (factory := get_factory(dic['cell_type'])) is not None
+        ]
+        key = (nb['nbformat'], nb['nbformat_minor'])
+        version = _VERSION_CACHE.get(key)
+        if version is None:
+            version = _VERSION_CACHE[key] = f"{key[0]}.{key[1]}"
+        return Notebook(version, cells)
+
+    def iter_cells(self):
+        r"""Iterates the cells of the file one at a time, without loading
+        the whole notebook in memory (when ijson is available).
+
+        Usage:
+
+            >>> for cell in NotebookLoader("samples/hello-world.ipynb").iter_cells():
+            ...     print(cell.id)
+            a9541506
+            b777420a
+            a23ab5ac
+        """
+        if ijson is None:
+            yield from self.load()
+            return
+        with open(self.filename, 'rb') as f:
+            for dic in ijson.items(f, 'cells.item', use_float=True):
+                factory = _CELL_FACTORIES.get(dic['cell_type'])
+                if factory is not None:
+                    yield factory(dic)
+
+class Markdownizer:
     r"""Transforms a notebook to a pure markdown notebook.
 
     Args:
@@ -159,16 +298,17 @@ class Markdownizer(Notebook):
     """
 
     def __init__(self, notebook):
-        self.cells = notebook.cells
-        self.version = notebook.version
+        self.notebook = notebook
 
     def markdownize(self):
         r"""Transforms the notebook to a pure markdown notebook.
+
+        Returns:
+            Notebook: the transformed notebook (modified in place)
         """
-        for cell in self.cells:
-            if isinstance(cell, CodeCell):
-                cell.__class__ = MarkdownCell
-        return self
+        return self.notebook.map_cells(
+            lambda cell: MarkdownCell(cell.id, cell.source) if type(cell) is CodeCell else cell
+        )
 
 class MarkdownLesser:
     r"""Removes markdown cells from a notebook.
@@ -186,21 +326,16 @@ class MarkdownLesser:
                 | print("Hello world!")
     """
     def __init__(self, notebook):
-        self.version = notebook.version
-        self.cells = notebook.cells
+        self.notebook = notebook
 
     def remove_markdown_cells(self):
         r"""Removes markdown cells from the notebook.
 
         Returns:
-            Notebook: a Notebook instance with only code cells
+            Notebook: a new Notebook instance with only code cells
         """
-        new_cells = []
-        for cell in self.cells:
-            if not isinstance(cell, MarkdownCell):
-                new_cells.append(cell)
-        self.cells = new_cells
-        return self
+        nb = self.notebook
+        return Notebook(nb.version, nb.cells).filter_cells(lambda cell: type(cell) is CodeCell)
 
 class PyPercentLoader:
     r"""Loads a Jupyter Notebook from a py-percent file.
@@ -225,51 +360,32 @@ class PyPercentLoader:
             a23ab5ac
     """
 
-    def __init__(self, filename, version="4.5"):
+    def __init__(self, filename: str, version: str = "4.5"):
         self.filename = filename
         self.version = version
 
-    def load(self):
+    def load(self) -> Notebook:
         r"""Loads a Notebook instance from the py-percent file.
         """
-        with open(self.filename, "r") as f:
-            lines = f.readlines()
-        cells = []
-        counter = 0 #indique à quel indice on est de la liste lines
-        id = 0 #il faut donner un id à chaque cellule, mais on ne connait pas l'id d'origine, donc on en attribue un "au hasard"
-        l = len(lines)
-        while counter < l - 1:
-            #if lines[counter][:4] == "# $$":
-            if "markdown" in lines[counter]:
-                counter += 1
-                markdown_cell = []
-                blankline = False
-                while counter < l - 1 and blankline == False:
-                    if lines[counter] == "\n":
-                        counter += 1
-                        blankline = True
-                    elif lines[counter][-1:] == "\n":
-                        markdown_cell.append(lines[counter][2:-1])
-                        counter += 1
-                    else:
-                        markdown_cell.append(lines[counter][2:])
-                        counter += 1
-                cells.append(MarkdownCell(id, markdown_cell))
-                id += 1
+        cells: List[CodeCell] = []
+        source: List[str] = []
+        state: Optional[str] = None # None between cells, then "markdown" or "code" inside a cell
+        with open(self.filename, "rb") as f:
+            lines = f.read().splitlines()
+        # the trailing blank line closes the last cell if the file does not
+        for line in itertools.chain(lines, [b""]):
+            if state is None:
+                if not line.strip():
+                    continue
+                state = "markdown" if line.startswith(_MARKDOWN_HEADER_BYTES) else "code"
+                source = []
+            elif not line:
+                if state == "markdown":
+                    cells.append(MarkdownCell(len(cells), source))
+                else:
+                    cells.append(CodeCell(len(cells), source, 1)) #execution_count = 1
+                state = None
             else:
-                counter += 1
-                code_cell = []
-                blankline = False
-                while counter < l - 1 and blankline == False:
-                    if lines[counter] == "\n":
-                        counter += 1
-                        blankline = True
-                    elif lines[counter][-1:] == "\n":
-                        code_cell.append(lines[counter][:-1])
-                        counter += 1
-                    else:
-                        code_cell.append(lines[counter])
-                        counter += 1
-                cells.append(CodeCell(id, code_cell, 1)) #execution_count = 1
-                id += 1
+                text = line.decode("utf-8")
+                source.append(text[2:] if state == "markdown" else text)
         return Notebook(self.version, cells)                           
\ No newline at end of file
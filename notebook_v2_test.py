@@ -1,10 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
+import pickle
+import tempfile
 import unittest
+from unittest import mock
 
 from notebook_v1 import * #rajouté par moi (pour la question 19)
 from notebook_v2 import *
+import notebook_v2
 
 class Question15(unittest.TestCase):
     def test_build_code_cell(self):
@@ -51,6 +56,48 @@ class Question16(unittest.TestCase):
         self.assertEqual("b777420a", nb.cells[1].id)
         self.assertEqual("a23ab5ac", nb.cells[2].id)
 
+    def test_load_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "empty.ipynb")
+            open(filename, "wb").close()
+            with self.assertRaises(ValueError) as context:
+                NotebookLoader(filename).load()
+            self.assertNotIn("mmap", str(context.exception))
+
+    def test_load_cached(self):
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(notebook_v2, "_CACHE_DIR", cache_dir):
+            nb = NotebookLoader("samples/hello-world.ipynb", cache=True).load()
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+            self.assertFalse(os.path.exists("samples/hello-world.ipynb.pkl"))
+            with mock.patch.object(NotebookLoader, "_parse", side_effect=AssertionError("cache not used")):
+                nb2 = NotebookLoader("samples/hello-world.ipynb", cache=True).load()
+            self.assertEqual(nb.version, nb2.version)
+            self.assertEqual([cell.id for cell in nb], [cell.id for cell in nb2])
+
+    def test_load_cached_foreign_pickle(self):
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(notebook_v2, "_CACHE_DIR", cache_dir):
+            NotebookLoader("samples/hello-world.ipynb", cache=True).load()
+            cache_filename = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+            with open(cache_filename, "wb") as f:
+                pickle.dump("not a cached notebook", f)
+            nb = NotebookLoader("samples/hello-world.ipynb", cache=True).load()
+            self.assertEqual(3, len(nb.cells))
+
+    def test_iter_cells_hello_world(self):
+        cells = NotebookLoader("samples/hello-world.ipynb").iter_cells()
+        self.assertEqual(["a9541506", "b777420a", "a23ab5ac"], [cell.id for cell in cells])
+
+    def test_notebook_from_iterator(self):
+        nb = Notebook("4.5", NotebookLoader("samples/hello-world.ipynb").iter_cells())
+        self.assertIsInstance(nb.cells, list)
+        self.assertEqual(3, len(nb.cells))
+
+    def test_notebook_from_iterator_read_after_iteration(self):
+        nb = Notebook("4.5", NotebookLoader("samples/hello-world.ipynb").iter_cells())
+        self.assertEqual(3, len(list(nb)))
+        self.assertEqual(3, len(nb.cells))
+        self.assertEqual(["a9541506", "b777420a", "a23ab5ac"], [cell.id for cell in nb])
+
 class Question17(unittest.TestCase):
     def test_markdownizer(self):
         nb = NotebookLoader("samples/hello-world.ipynb").load()
@@ -82,6 +129,19 @@ class Question19(unittest.TestCase):
         self.assertIsInstance(nb2.cells[1], CodeCell)
         self.assertIsInstance(nb2.cells[2], MarkdownCell)
 
+    def test_py_percent_loader_line_endings(self):
+        with open("samples/line-endings-py-percent.py", "wb") as f:
+            f.write("# %% [markdown]\r\n#é title\r\n\r\n# %%\r\nprint('👋')".encode("utf-8"))
+        try:
+            nb = PyPercentLoader("samples/line-endings-py-percent.py").load()
+        finally:
+            os.remove("samples/line-endings-py-percent.py")
+        self.assertEqual(2, len(nb.cells))
+        self.assertIsInstance(nb.cells[0], MarkdownCell)
+        self.assertEqual([" title"], nb.cells[0].source)
+        self.assertIsInstance(nb.cells[1], CodeCell)
+        self.assertEqual(["print('👋')"], nb.cells[1].source)
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()